@@ -2,6 +2,7 @@
 """Interactive tool to select which posts to include in RSS feed."""
 import sys
 import json
+from collections import defaultdict
 from pathlib import Path
 
 # Add src to path
@@ -11,6 +12,27 @@ from instagram_parser import InstagramParser
 from instagram_json_parser import InstagramJSONParser
 
 
+def build_post_index(posts):
+    """Precompute per-post filter fields in a single pass.
+
+    Filters then operate on compact lists and a year->indices mapping
+    instead of re-walking every InstagramPost per filter.
+    """
+    years = []
+    has_tags = []
+    has_loc = []
+    year_index = defaultdict(list)
+
+    for idx, post in enumerate(posts):
+        year = post.year
+        years.append(year)
+        has_tags.append(bool(post.hashtags))
+        has_loc.append(bool(post.latitude and post.longitude))
+        year_index[year].append(idx)
+
+    return years, has_tags, has_loc, year_index
+
+
 def load_selection(selection_file: Path):
     """Load previously saved post selection."""
     if selection_file.exists():
@@ -100,6 +122,7 @@ def bulk_selection(posts):
     """Bulk selection mode with filters."""
     selection_file = Path("selected_posts.json")
     selected = load_selection(selection_file)
+    years, has_tags, has_loc, year_index = build_post_index(posts)
 
     print("\n" + "="*80)
     print("BULK POST SELECTION")
@@ -128,55 +151,38 @@ def bulk_selection(posts):
             print(f"✓ Selected all {len(selected)} posts")
 
         elif choice == '2':
-            years = {}
-            for idx, post in enumerate(posts):
-                year = post.date.split(',')[1].strip().split()[0] if ',' in post.date else 'Unknown'
-                if year not in years:
-                    years[year] = []
-                years[year].append(idx)
-
             print("\nAvailable years:")
-            for year in sorted(years.keys()):
-                count = len(years[year])
-                in_selection = sum(1 for i in years[year] if i in selected)
+            for year in sorted(year_index.keys()):
+                count = len(year_index[year])
+                in_selection = sum(1 for i in year_index[year] if i in selected)
                 print(f"  {year}: {count} posts ({in_selection} selected)")
 
             year_input = input("\nEnter years (comma-separated, e.g., 2023,2024): ").strip()
             for year in year_input.split(','):
                 year = year.strip()
-                if year in years:
-                    for idx in years[year]:
-                        selected.add(idx)
-                    print(f"✓ Added {len(years[year])} posts from {year}")
+                if year in year_index:
+                    selected.update(year_index[year])
+                    print(f"✓ Added {len(year_index[year])} posts from {year}")
 
         elif choice == '3':
-            count = 0
-            for idx, post in enumerate(posts):
-                if post.hashtags:
-                    selected.add(idx)
-                    count += 1
-            print(f"✓ Selected {count} posts with hashtags")
+            matched = [idx for idx, tagged in enumerate(has_tags) if tagged]
+            selected.update(matched)
+            print(f"✓ Selected {len(matched)} posts with hashtags")
 
         elif choice == '4':
-            count = 0
-            for idx, post in enumerate(posts):
-                if post.latitude and post.longitude:
-                    selected.add(idx)
-                    count += 1
-            print(f"✓ Selected {count} posts with location data")
+            matched = [idx for idx, located in enumerate(has_loc) if located]
+            selected.update(matched)
+            print(f"✓ Selected {len(matched)} posts with location data")
 
         elif choice == '5':
             print("\nEnter date range (format: YYYY)")
             start_year = input("From year: ").strip()
             end_year = input("To year: ").strip()
 
-            count = 0
-            for idx, post in enumerate(posts):
-                year = post.date.split(',')[1].strip().split()[0] if ',' in post.date else ''
-                if start_year <= year <= end_year:
-                    selected.add(idx)
-                    count += 1
-            print(f"✓ Selected {count} posts from {start_year} to {end_year}")
+            matched = [idx for idx, year in enumerate(years)
+                       if year != 'Unknown' and start_year <= year <= end_year]
+            selected.update(matched)
+            print(f"✓ Selected {len(matched)} posts from {start_year} to {end_year}")
 
         elif choice == '6':
             confirm = input("Clear all selections? (y/n): ").strip().lower()
@@ -224,13 +230,19 @@ def show_statistics(posts, selected):
     print(f"Not selected: {len(posts) - len(selected)}")
 
     if selected:
-        selected_posts = [posts[i] for i in selected if i < len(posts)]
         years = {}
-        with_hashtags = sum(1 for p in selected_posts if p.hashtags)
-        with_location = sum(1 for p in selected_posts if p.latitude and p.longitude)
-
-        for post in selected_posts:
-            year = post.date.split(',')[1].strip().split()[0] if ',' in post.date else 'Unknown'
+        with_hashtags = 0
+        with_location = 0
+
+        for i in selected:
+            if i >= len(posts):
+                continue
+            post = posts[i]
+            if post.hashtags:
+                with_hashtags += 1
+            if post.latitude and post.longitude:
+                with_location += 1
+            year = post.year
             years[year] = years.get(year, 0) + 1
 
         print(f"\nSelected posts by year:")
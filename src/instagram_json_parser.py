@@ -1,29 +1,49 @@
 """Parser for Instagram JSON export files."""
-import json
+import mmap
 import re
-from dataclasses import dataclass
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
+
+from regex_utils import HASHTAG_STRIP_RE
+
+try:
+    # orjson parses roughly 5x faster than stdlib json and consumes
+    # bytes directly, skipping the text decode step.
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+try:
+    # ijson streams one post at a time, keeping peak memory flat on
+    # multi-hundred-MB exports where json.load roughly doubles RSS.
+    import ijson
+except ImportError:
+    ijson = None
+
+# Below this file size the whole-file parse is faster than streaming.
+_STREAM_THRESHOLD = 50 * 1024 * 1024
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
 
 
-@dataclass
+# slots=True drops the per-instance __dict__, roughly halving memory
+# for large archives and speeding attribute access in filter loops.
+@dataclass(slots=True)
 class InstagramPost:
     """Represents an Instagram post."""
     title: str
     images: List[str]  # Relative paths to images
     date: str
     timestamp: int
+    year: str = "Unknown"
     latitude: Optional[float] = None
     longitude: Optional[float] = None
-    tagged_users: List[str] = None
-    hashtags: List[str] = None
-
-    def __post_init__(self):
-        if self.tagged_users is None:
-            self.tagged_users = []
-        if self.hashtags is None:
-            self.hashtags = []
+    tagged_users: List[str] = field(default_factory=list)
+    hashtags: List[str] = field(default_factory=list)
 
 
 class InstagramJSONParser:
@@ -36,7 +56,9 @@ class InstagramJSONParser:
 
     def _fix_encoding(self, text: str) -> str:
         """Fix double-encoded UTF-8 text (common in Instagram exports)."""
-        if not text:
+        if not text or text.isascii():
+            # ASCII text round-trips unchanged; skip the two
+            # allocations of the encode/decode dance.
             return text
         try:
             # Try to fix UTF-8 interpreted as Latin-1
@@ -47,23 +69,30 @@ class InstagramJSONParser:
 
     def _extract_hashtags(self, text: str) -> tuple[str, List[str]]:
         """Extract hashtags from text and return cleaned text + hashtags list."""
-        if not text:
+        if not text or '#' not in text:
+            # Cheap membership test skips the regex machinery entirely
+            # for the common caption without hashtags.
             return text, []
 
-        # Find all hashtags
-        hashtags = re.findall(r'#(\w+)', text)
-
-        # Remove duplicates while preserving order
+        # Extract and strip in one pass: the sub callback collects each
+        # hashtag (deduped case-insensitively, order preserved) while
+        # removing it from the text, so the caption is scanned once
+        # instead of separate findall + sub passes.
         seen = set()
         unique_hashtags = []
-        for tag in hashtags:
-            tag_lower = tag.lower()
+
+        def _take(match: re.Match) -> str:
+            # Hashtags repeat heavily across an archive; interning
+            # collapses duplicates to one shared string and makes the
+            # set membership test a pointer compare.
+            tag = sys.intern(match.group(1))
+            tag_lower = sys.intern(tag.lower())
             if tag_lower not in seen:
                 seen.add(tag_lower)
                 unique_hashtags.append(tag)
+            return ''
 
-        # Remove hashtags from text
-        clean_text = re.sub(r'\s*#\w+', '', text).strip()
+        clean_text = HASHTAG_STRIP_RE.sub(_take, text).strip()
 
         return clean_text, unique_hashtags
 
@@ -72,17 +101,42 @@ class InstagramJSONParser:
         if not self.posts_json.exists():
             raise FileNotFoundError(f"Posts file not found: {self.posts_json}")
 
-        with open(self.posts_json, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        posts = []
-        for post_data in data:
-            post = self._parse_post(post_data)
-            if post:
-                posts.append(post)
-
-        # Sort by timestamp, newest first
-        posts.sort(key=lambda p: p.timestamp, reverse=True)
+        size = self.posts_json.stat().st_size
+        if ijson is not None and size > _STREAM_THRESHOLD:
+            # Stream-parse huge exports so raw text and parsed tree are
+            # never both resident.
+            with open(self.posts_json, 'rb') as f:
+                posts = [p for p in (self._parse_post(pd) for pd in ijson.items(f, 'item')) if p]
+        else:
+            if size > _STREAM_THRESHOLD:
+                # ijson unavailable: mmap the file and hand the parser a
+                # zero-copy view instead of allocating a full bytes copy.
+                with open(self.posts_json, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    try:
+                        data = _json.loads(memoryview(mm))
+                    except TypeError:
+                        # stdlib json doesn't take memoryview
+                        data = _json.loads(mm[:])
+            else:
+                data = _json.loads(self.posts_json.read_bytes())
+
+            # Per-post parsing is pure CPU work (dict walks, regex, date
+            # formatting) and embarrassingly parallel. Pool spin-up costs
+            # more than it saves on small exports, so stay serial there.
+            if len(data) > 1000:
+                with ProcessPoolExecutor() as executor:
+                    posts = [p for p in executor.map(self._parse_post, data, chunksize=256) if p]
+            else:
+                posts = []
+                for post_data in data:
+                    post = self._parse_post(post_data)
+                    if post:
+                        posts.append(post)
+
+        # Sort by timestamp, newest first; attrgetter extracts the key
+        # in C rather than through a per-element lambda call
+        posts.sort(key=attrgetter('timestamp'), reverse=True)
 
         return posts
 
@@ -106,7 +160,7 @@ class InstagramJSONParser:
             timestamp = 0
 
         # Format date
-        date = self._format_timestamp(timestamp)
+        date, year = self._format_timestamp(timestamp)
 
         images = []
         latitude = None
@@ -122,7 +176,12 @@ class InstagramJSONParser:
             if uri:
                 images.append(uri)
 
-            # Check for location data in photo_metadata
+            # Check for location data in photo_metadata. Once both
+            # coordinates are known only URIs remain to collect, so
+            # skip the metadata descent for the rest of the carousel.
+            if latitude and longitude:
+                continue
+
             media_metadata = media.get('media_metadata', {})
             photo_metadata = media_metadata.get('photo_metadata', {})
             exif_data = photo_metadata.get('exif_data', [])
@@ -132,6 +191,8 @@ class InstagramJSONParser:
                     latitude = exif.get('latitude')
                 if exif.get('longitude') and not longitude:
                     longitude = exif.get('longitude')
+                if latitude and longitude:
+                    break
 
         # Skip if no images
         if not images:
@@ -145,21 +206,30 @@ class InstagramJSONParser:
             images=images,
             date=date,
             timestamp=timestamp,
+            year=year,
             latitude=latitude,
             longitude=longitude,
             hashtags=hashtags
         )
 
-    def _format_timestamp(self, timestamp: int) -> str:
-        """Convert Unix timestamp to readable date string."""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _format_timestamp(timestamp: int) -> tuple[str, str]:
+        """Convert Unix timestamp to (date string, year string).
+
+        Cached because posts in the same second (carousel uploads)
+        share timestamps, and strftime is comparatively expensive.
+        The year comes for free from the same datetime, saving the
+        date-string re-parse that select_posts used to do per filter.
+        """
         if not timestamp:
-            return "Unknown date"
+            return "Unknown date", "Unknown"
 
         try:
             dt = datetime.fromtimestamp(timestamp)
-            return dt.strftime("%b %d, %Y %I:%M %p")
+            return dt.strftime("%b %d, %Y %I:%M %p"), str(dt.year)
         except (ValueError, OSError):
-            return "Unknown date"
+            return "Unknown date", "Unknown"
 
     def get_full_image_path(self, relative_path: str) -> Path:
         """Convert relative image path to full path."""
@@ -1,27 +1,46 @@
 """Parser for Instagram export HTML files."""
-import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Optional
-from bs4 import BeautifulSoup
+from lxml import etree, html
 
+# Precompiled XPath expressions for the known Instagram export markup.
+# Compiling once at import time lets every extraction run as a single
+# C-level traversal instead of repeated Python-side find/find_all walks.
+_XP_POSTS = etree.XPath(".//div[contains(@class, 'uiBoxWhite')]")
+_XP_TITLE = etree.XPath("string(.//h2[contains(@class, '_a6-h')])")
+_XP_DATE = etree.XPath("string(.//div[contains(@class, '_a6-o')])")
+_XP_IMAGES = etree.XPath(".//div[contains(@class, '_a6-p')]//img[contains(@class, '_a6_o')]/@src")
+_XP_ROWS = etree.XPath(".//table//tr")
+_XP_ROW_TEXTS = etree.XPath("td//div[contains(@class, '_a6-q')]")
 
-@dataclass
+
+def _extract_year(date: str) -> str:
+    """Extract the year from a date string like 'Aug 22, 2025 8:18 am'."""
+    return date.split(',')[1].strip().split()[0] if ',' in date else 'Unknown'
+
+
+def _safe_float(value: str) -> Optional[float]:
+    """Parse a float, returning None on malformed input."""
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+# slots=True drops the per-instance __dict__, roughly halving memory
+# for large archives and speeding attribute access in filter loops.
+@dataclass(slots=True)
 class InstagramPost:
     """Represents an Instagram post."""
     title: str
     images: List[str]  # Relative paths to images
     date: str
+    year: str = "Unknown"
     latitude: Optional[float] = None
     longitude: Optional[float] = None
-    tagged_users: List[str] = None
-    hashtags: List[str] = None
-
-    def __post_init__(self):
-        if self.tagged_users is None:
-            self.tagged_users = []
-        if self.hashtags is None:
-            self.hashtags = []
+    tagged_users: List[str] = field(default_factory=list)
+    hashtags: List[str] = field(default_factory=list)
 
 
 class InstagramParser:
@@ -37,66 +56,46 @@ class InstagramParser:
         if not self.posts_html.exists():
             raise FileNotFoundError(f"Posts file not found: {self.posts_html}")
 
-        with open(self.posts_html, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
+        with open(self.posts_html, 'rb') as f:
+            doc = html.parse(f).getroot()
 
         posts = []
         # Find all post containers
-        post_divs = soup.find_all('div', class_='pam _3-95 _2ph- _a6-g uiBoxWhite noborder')
-
-        for post_div in post_divs:
+        for post_div in _XP_POSTS(doc):
             post = self._parse_post_div(post_div)
             if post:
                 posts.append(post)
 
         return posts
 
-    def _parse_post_div(self, post_div) -> Optional[InstagramPost]:
+    def _parse_post_div(self, post_div: html.HtmlElement) -> Optional[InstagramPost]:
         """Parse a single post div element."""
-        # Extract title
-        title_elem = post_div.find('h2', class_='_3-95 _2pim _a6-h _a6-i')
-        title = title_elem.get_text() if title_elem else ""
-
-        # Extract date
-        date_elem = post_div.find('div', class_='_3-94 _a6-o')
-        date = date_elem.get_text() if date_elem else ""
+        # Extract title and date
+        title = _XP_TITLE(post_div)
+        date = _XP_DATE(post_div)
 
         # Extract images
-        content_div = post_div.find('div', class_='_3-95 _a6-p')
-        images = []
-        if content_div:
-            img_tags = content_div.find_all('img', class_='_a6_o _3-96')
-            for img in img_tags:
-                src = img.get('src')
-                if src:
-                    images.append(src)
+        images = [src for src in _XP_IMAGES(post_div) if src]
 
         # Extract location data
         latitude = None
         longitude = None
-        tables = post_div.find_all('table')
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all('td')
-                if len(cells) >= 2:
-                    label_div = cells[0].find('div', class_='_a6-q')
-                    value_div = cells[1].find('div', class_='_a6-q') if len(cells) > 1 else None
-
-                    if label_div and value_div:
-                        label = label_div.get_text().strip()
-                        value = value_div.get_text().strip()
-
-                        if label == 'Latitude' and value:
-                            try:
-                                latitude = float(value)
-                            except ValueError:
-                                pass
-                        elif label == 'Longitude' and value:
-                            try:
-                                longitude = float(value)
-                            except ValueError:
-                                pass
+        for row in _XP_ROWS(post_div):
+            cells = _XP_ROW_TEXTS(row)
+            if len(cells) < 2:
+                continue
+
+            label = cells[0].text_content().strip()
+            value = cells[1].text_content().strip()
+
+            if label == 'Latitude' and value:
+                latitude = _safe_float(value)
+            elif label == 'Longitude' and value:
+                longitude = _safe_float(value)
+
+            # Both coordinates found; skip the remaining rows
+            if latitude is not None and longitude is not None:
+                break
 
         # Skip empty posts
         if not images and not title:
@@ -106,6 +105,7 @@ class InstagramParser:
             title=title,
             images=images,
             date=date,
+            year=_extract_year(date),
             latitude=latitude,
             longitude=longitude
         )
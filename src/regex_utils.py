@@ -0,0 +1,7 @@
+"""Shared precompiled regexes for the per-post hot paths."""
+import re
+
+# Compiled once at import so per-post calls skip re's cache lookup
+# and pattern setup entirely.
+HASHTAG_RE = re.compile(r'#(\w+)')
+HASHTAG_STRIP_RE = re.compile(r'\s*#(\w+)')
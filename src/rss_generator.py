@@ -1,15 +1,81 @@
 """Generate RSS feed from Instagram posts."""
+import sys
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
-from datetime import datetime
+from datetime import date
 from typing import List
-import re
+from xml.sax.saxutils import escape
 from instagram_parser import InstagramPost
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
-
-# Register namespaces for proper XML generation
-ET.register_namespace('atom', 'http://www.w3.org/2005/Atom')
-ET.register_namespace('content', 'http://purl.org/rss/1.0/modules/content/')
+from regex_utils import HASHTAG_RE
+
+# The feed is emitted as templated text rather than an ElementTree:
+# per-post SubElement calls (object construction, parent linking, dict
+# churn) dominated generate_feed on large archives, while formatting
+# into a buffer is a single linear pass over the data.
+_FEED_HEADER_TPL = """<?xml version="1.0" encoding="utf-8"?>
+<rss xmlns:atom="http://www.w3.org/2005/Atom" xmlns:content="http://purl.org/rss/1.0/modules/content/" version="2.0">
+  <channel>
+    <title>Instagram Archive</title>
+    <link>{base_url}</link>
+    <description>Posts from Instagram export</description>
+    <language>en</language>
+    <atom:link href="{base_url}/feed.xml" rel="self" type="application/rss+xml"/>
+"""
+
+_ITEM_TPL = """    <item>
+      <title>{title}</title>
+      <link>{link}</link>
+      <guid isPermaLink="true">{link}</guid>
+{pubdate}      <description>{description}</description>
+      <content:encoded>{content}</content:encoded>
+{categories}    </item>
+"""
+
+_FEED_FOOTER = """  </channel>
+</rss>
+"""
+
+
+# Per-item HTML fragments hoisted to module scope so the long inline
+# style strings are materialized once, not per tag/image per post.
+_TAG_TPL = '<span style="display: inline-block; background: #e1f5fe; color: #01579b; padding: 4px 8px; margin: 2px; border-radius: 4px; font-size: 14px;">#{0}</span>'
+_IMG_TPL = '<p style="margin: 30px 0;"><img src="{0}" style="max-width: 100%; display: block;" /></p>'
+
+
+_MONTH_NUM = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+              'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
+_WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+
+@lru_cache(maxsize=4096)
+def _to_rfc822(date_str: str) -> str:
+    """Convert 'Aug 22, 2025 8:18 AM' to RFC 822, caching results.
+
+    A hand parser over this fixed format beats strptime+strftime
+    (format compile, locale lookup) several-fold, and the cache
+    collapses posts sharing the same date string. Raises ValueError
+    (or KeyError/IndexError) on malformed input.
+    """
+    mon_s, rest = date_str.split(' ', 1)
+    day_s, rest = rest.split(',', 1)
+    year_s, time_s, ampm = rest.split()
+    hour_s, minute_s = time_s.split(':')
+
+    month = _MONTH_NUM[mon_s]
+    year = int(year_s)
+    day = int(day_s)
+    hour = int(hour_s)
+    if not 1 <= hour <= 12:
+        raise ValueError(f"hour out of range: {date_str!r}")
+    if ampm.lower() == 'pm':
+        hour = hour % 12 + 12
+    else:
+        hour = hour % 12
+
+    # date() validates day-of-month and gives the weekday cheaply
+    weekday = _WEEKDAYS[date(year, month, day).weekday()]
+    return f'{weekday}, {day:02d} {mon_s} {year} {hour:02d}:{int(minute_s):02d}:00 +0000'
 
 
 class RSSGenerator:
@@ -24,111 +90,96 @@ class RSSGenerator:
         if len(text) <= max_length:
             return text
 
+        # One pass over the candidate window records the first occurrence
+        # of each boundary, replacing four full-string find() scans.
+        head = text[:max_length + 2]
+        dot = bang = question = comma = -1
+        for i in range(len(head) - 1):
+            if head[i + 1] == ' ':
+                ch = head[i]
+                if ch == '.' and dot < 0:
+                    dot = i
+                elif ch == '!' and bang < 0:
+                    bang = i
+                elif ch == '?' and question < 0:
+                    question = i
+                elif ch == ',' and comma < 0:
+                    comma = i
+
         # First, try to cut at first sentence (period, exclamation, question mark)
         # but only if we get at least a few words (15 chars minimum)
-        for delimiter in ['. ', '! ', '? ']:
-            pos = text.find(delimiter)
+        for pos in (dot, bang, question):
             if 15 <= pos <= max_length:
                 return text[:pos + 1]  # Include the punctuation
 
         # Next, try to cut at comma if we get a decent amount of text
-        comma_pos = text.find(', ')
-        if 15 <= comma_pos <= max_length:
-            return text[:comma_pos]
+        if 15 <= comma <= max_length:
+            return text[:comma]
 
         # Fall back to word boundary truncation
-        if len(text) > max_length:
-            truncated = text[:max_length].rsplit(' ', 1)[0]
-            return truncated + '...'
-
-        return text
+        truncated = text[:max_length].rsplit(' ', 1)[0]
+        return truncated + '...'
 
     def _extract_hashtags(self, text: str) -> List[str]:
         """Extract hashtags from text."""
-        if not text:
+        if not text or '#' not in text:
+            # Cheap membership test skips the regex scan for captions
+            # without hashtags.
             return []
         # Find all hashtags (word characters after #)
-        hashtags = re.findall(r'#(\w+)', text)
+        hashtags = HASHTAG_RE.findall(text)
         # Remove duplicates while preserving order
         seen = set()
         unique_hashtags = []
         for tag in hashtags:
-            tag_lower = tag.lower()
+            # Interning collapses repeated tags across posts to one
+            # shared string and speeds the set membership test.
+            tag_lower = sys.intern(tag.lower())
             if tag_lower not in seen:
                 seen.add(tag_lower)
-                unique_hashtags.append(tag)
+                unique_hashtags.append(sys.intern(tag))
         return unique_hashtags
 
-    def generate_feed(self, posts: List[InstagramPost], output_path: Path):
+    def generate_feed(self, posts: List[InstagramPost], output_path: Path) -> None:
         """Generate RSS feed XML file."""
-        rss = ET.Element('rss', version='2.0')
-        rss.set('xmlns:atom', 'http://www.w3.org/2005/Atom')
-        rss.set('xmlns:content', 'http://purl.org/rss/1.0/modules/content/')
-
-        channel = ET.SubElement(rss, 'channel')
-
-        # Channel metadata
-        ET.SubElement(channel, 'title').text = 'Instagram Archive'
-        ET.SubElement(channel, 'link').text = self.base_url
-        ET.SubElement(channel, 'description').text = 'Posts from Instagram export'
-        ET.SubElement(channel, 'language').text = 'en'
-
-        # Self link
-        atom_link = ET.SubElement(channel, 'atom:link')
-        atom_link.set('href', f'{self.base_url}/feed.xml')
-        atom_link.set('rel', 'self')
-        atom_link.set('type', 'application/rss+xml')
+        buf = BytesIO()
+        buf.write(_FEED_HEADER_TPL.format(base_url=escape(self.base_url)).encode('utf-8'))
 
         # Add items (posts)
         for idx, post in enumerate(posts):
-            self._add_item(channel, post, idx)
-
-        # Pretty print and save
-        xml_str = minidom.parseString(ET.tostring(rss)).toprettyxml(indent='  ')
+            buf.write(self._render_item(post, idx).encode('utf-8'))
 
-        # Remove extra blank lines
-        xml_lines = [line for line in xml_str.split('\n') if line.strip()]
-        xml_str = '\n'.join(xml_lines)
-
-        output_path.write_text(xml_str, encoding='utf-8')
+        buf.write(_FEED_FOOTER.encode('utf-8'))
+        output_path.write_bytes(buf.getvalue())
         print(f"✓ RSS feed generated: {output_path}")
 
-    def _add_item(self, channel: ET.Element, post: InstagramPost, idx: int):
-        """Add a single post as RSS item."""
-        item = ET.SubElement(channel, 'item')
-
-        # Title (truncated for RSS)
+    def _render_item(self, post: InstagramPost, idx: int) -> str:
+        """Render a single post as an RSS item."""
+        # Title (truncated for RSS); the inline length check skips the
+        # truncation call for the common short caption
         full_title = post.title or f'Instagram Post {idx + 1}'
-        title = self._truncate_title(full_title, max_length=100)
-        ET.SubElement(item, 'title').text = title
+        title = full_title if len(full_title) <= 100 else self._truncate_title(full_title, max_length=100)
 
-        # Link
+        # Link (doubles as permalink GUID)
         post_url = f'{self.base_url}/posts/post-{idx + 1}.html'
-        ET.SubElement(item, 'link').text = post_url
-
-        # GUID
-        guid = ET.SubElement(item, 'guid')
-        guid.set('isPermaLink', 'true')
-        guid.text = post_url
 
         # Publication date
         pub_date = self._parse_date(post.date)
-        if pub_date:
-            ET.SubElement(item, 'pubDate').text = pub_date
-
-        # Description with images
-        description = self._create_description(post, idx)
-        ET.SubElement(item, 'description').text = description
-
-        # Content (full HTML)
-        content_html = self._create_content_html(post)
-        content = ET.SubElement(item, 'content:encoded')
-        content.text = content_html
-
-        # Add hashtags as categories
-        for hashtag in post.hashtags:
-            category = ET.SubElement(item, 'category')
-            category.text = hashtag
+        pubdate = f'      <pubDate>{pub_date}</pubDate>\n' if pub_date else ''
+
+        # Hashtags as categories
+        categories = ''.join(
+            f'      <category>{escape(hashtag)}</category>\n' for hashtag in post.hashtags
+        )
+
+        return _ITEM_TPL.format(
+            title=escape(title),
+            link=escape(post_url),
+            pubdate=pubdate,
+            description=escape(self._create_description(post, idx)),
+            content=escape(self._create_content_html(post)),
+            categories=categories,
+        )
 
     def _create_description(self, post: InstagramPost, idx: int) -> str:
         """Create description text for RSS item."""
@@ -158,15 +209,14 @@ class RSSGenerator:
 
         # Add hashtags as styled tags
         if post.hashtags:
-            tags = ' '.join([f'<span style="display: inline-block; background: #e1f5fe; color: #01579b; padding: 4px 8px; margin: 2px; border-radius: 4px; font-size: 14px;">#{tag}</span>' for tag in post.hashtags])
+            tags = ' '.join(_TAG_TPL.format(tag) for tag in post.hashtags)
             html_parts.append(f'<div style="margin: 15px 0;">{tags}</div>')
 
         # Add images
         for img_path in post.images:
             # Convert relative path to absolute URL
             img_filename = Path(img_path).name
-            img_url = f"{self.base_url}/images/{img_filename}"
-            html_parts.append(f'<p style="margin: 30px 0;"><img src="{img_url}" style="max-width: 100%; display: block;" /></p>')
+            html_parts.append(_IMG_TPL.format(f"{self.base_url}/images/{img_filename}"))
 
         # Add location if available
         if post.latitude and post.longitude:
@@ -180,16 +230,8 @@ class RSSGenerator:
             return ''
 
         try:
-            # Try to parse Instagram date format
-            # Example: "Aug 22, 2025 8:18 am"
-            dt = datetime.strptime(date_str, "%b %d, %Y %I:%M %p")
-            # Convert to RFC 822 format
-            return dt.strftime('%a, %d %b %Y %H:%M:%S +0000')
-        except ValueError:
-            try:
-                # Try alternative format
-                dt = datetime.strptime(date_str, "%b %d, %Y %I:%M %p")
-                return dt.strftime('%a, %d %b %Y %H:%M:%S +0000')
-            except ValueError:
-                # Return empty if can't parse
-                return ''
+            # Example input: "Aug 22, 2025 8:18 am"
+            return _to_rfc822(date_str)
+        except (ValueError, KeyError, IndexError):
+            # Return empty if can't parse
+            return ''
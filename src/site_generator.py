@@ -1,18 +1,328 @@
 """Generate a static website from Instagram posts."""
+import hashlib
+import json
+import os
+import shutil
+import string
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from html import escape
 from pathlib import Path
 from datetime import datetime
 from typing import List
-import shutil
 from instagram_parser import InstagramPost, InstagramParser
+from rss_generator import RSSGenerator
+
+
+# Shared stylesheet, written once to the site root. Inlining it in
+# every page cost ~1 KB of formatting and disk per post and defeated
+# browser caching; the pages just link it instead.
+_CSS_BYTES = b"""\
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
+    margin: 0 auto;
+    padding: 20px;
+    line-height: 1.6;
+}
+body.post {
+    max-width: 800px;
+}
+body.index {
+    max-width: 900px;
+}
+body.post h1 {
+    margin-bottom: 10px;
+}
+body.index h1 {
+    border-bottom: 3px solid #333;
+    padding-bottom: 10px;
+}
+.meta {
+    color: #666;
+    margin-bottom: 30px;
+}
+body.post img {
+    display: block;
+    margin: 20px auto;
+}
+a {
+    color: #0066cc;
+    text-decoration: none;
+}
+a:hover {
+    text-decoration: underline;
+}
+.rss-link {
+    background: #ff6600;
+    color: white;
+    padding: 10px 20px;
+    border-radius: 5px;
+    display: inline-block;
+    margin: 20px 0;
+}
+.rss-link:hover {
+    background: #cc5200;
+    text-decoration: none;
+}
+"""
+
+# Page templates compiled once at import. Re-evaluating the ~60-line
+# f-strings per post re-materialized the identical CSS/markup constants
+# every time; string.Template only pays for the substitution holes.
+_POST_HEADER_TMPL = string.Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$page_title</title>
+    <link rel="stylesheet" href="../styles.css">
+</head>
+<body class="post">
+    <a href="../index.html">← Back to all posts</a>
+
+    <article>
+        <h1>$title</h1>
+        <div class="meta">
+            <time>$date_str</time>
+        </div>
+
+        <p style="font-style: italic; color: #666; font-size: 14px; margin-bottom: 10px;">
+            Imported from Instagram.
+        </p>
+
+        <p style="font-size: 16px; line-height: 1.6; margin-bottom: 30px;">
+            $full_text
+        </p>
+
+""")
+
+_POST_FOOTER = """
+    </article>
+</body>
+</html>
+"""
+
+_INDEX_ARTICLE_TMPL = string.Template("""
+        <article style="border-bottom: 1px solid #eee; padding: 20px 0; display: flex; gap: 20px;">
+            $thumb_html
+            <div>
+                <h2 style="margin-top: 0;">
+                    <a href="posts/$post_id.html">$title</a>
+                </h2>
+                <p style="color: #666;">$date</p>
+                <p>$image_count image(s)</p>
+                $hashtags_index_html
+            </div>
+        </article>
+""")
+
+_INDEX_HEADER_TMPL = string.Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Instagram Archive</title>
+    <link rel="alternate" type="application/rss+xml" title="RSS Feed" href="feed.xml">
+    <link rel="stylesheet" href="styles.css">
+</head>
+<body class="index">
+    <h1>Instagram Archive</h1>
+
+    <a href="feed.xml" class="rss-link">📡 RSS Feed</a>
+
+    <p style="color: #666;">
+        $post_count posts from Instagram export
+    </p>
+
+    <div>
+""")
+
+_INDEX_FOOTER = """
+    </div>
+</body>
+</html>
+"""
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """Copy src to dst without going through user space where possible.
+
+    os.copy_file_range lets the kernel clone extents on CoW filesystems
+    (btrfs/XFS) or do a server-side copy on NFS, so no file data is
+    pumped through Python buffers. Where that is unsupported (EXDEV,
+    ENOSYS, EINVAL), os.sendfile still keeps the data in kernel space
+    with none of shutil's fast-path decision tree; only as a last
+    resort does a plain copyfile run. The generator doesn't need mtime
+    preserved, so copy2's metadata pass is skipped entirely.
+    """
+    if hasattr(os, 'copy_file_range'):
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                while os.copy_file_range(src_fd, dst_fd, 1 << 30):
+                    pass
+                return
+            except OSError:
+                pass  # fall through to sendfile
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+
+    if hasattr(os, 'sendfile'):
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                count = os.fstat(src_fd).st_size
+                sent = 0
+                while sent < count:
+                    sent += os.sendfile(dst_fd, src_fd, sent, count - sent)
+                return
+            except OSError:
+                pass  # fall through to the user-space copy
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+
+    # Last resort: buffered read/write with a 256 KiB buffer — four
+    # times shutil's default, so a quarter of the syscalls per MB on
+    # sequential image data.
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        shutil.copyfileobj(fsrc, fdst, length=256 * 1024)
+
+
+def _write_page(path: Path, data: bytes) -> None:
+    """Write page bytes, publishing atomically where the OS allows.
+
+    With O_TMPFILE the page is written to an anonymous file and only
+    linked in at its final name once complete, so a web server serving
+    the docs/ tree mid-regeneration never sees a partial page. os.write
+    on the raw fd also skips the buffered-stream wrapper. Falls back to
+    a plain write_bytes elsewhere.
+    """
+    if hasattr(os, 'O_TMPFILE'):
+        try:
+            fd = os.open(path.parent, os.O_TMPFILE | os.O_WRONLY, 0o644)
+        except OSError:
+            pass  # filesystem without O_TMPFILE support
+        else:
+            try:
+                os.write(fd, data)
+                src = f"/proc/self/fd/{fd}"
+                dst = str(path)
+                try:
+                    os.link(src, dst)
+                except FileExistsError:
+                    # linkat won't replace; drop the old page first
+                    os.unlink(dst)
+                    os.link(src, dst)
+                return
+            except OSError:
+                pass  # fall through to the plain write
+            finally:
+                os.close(fd)
+
+    path.write_bytes(data)
+
+
+@lru_cache(maxsize=4096)
+def _render_hashtags_post(tags: tuple) -> str:
+    """Render the hashtag block for a post page, cached per tag set.
+
+    Archives often reuse the same hashtags across many posts; the cache
+    collapses those to one string build per unique set.
+    """
+    spans = ' '.join([f'<span style="display: inline-block; background: #e1f5fe; color: #01579b; padding: 4px 8px; margin: 2px; border-radius: 4px; font-size: 14px;">#{tag}</span>' for tag in tags])
+    return f"""
+        <div style="margin: 20px 0;">
+            {spans}
+        </div>
+"""
+
+
+@lru_cache(maxsize=4096)
+def _render_hashtags_index(tags: tuple) -> str:
+    """Render the hashtag line for an index entry, cached per tag set."""
+    spans = ' '.join([f'<span style="display: inline-block; background: #e1f5fe; color: #01579b; padding: 3px 6px; margin: 2px; border-radius: 3px; font-size: 12px;">#{tag}</span>' for tag in tags])
+    return f'<div style="margin-top: 8px;">{spans}</div>'
+
+
+def _truncate_title(text: str, max_length: int = 60) -> str:
+    """Truncate title smartly at sentence/phrase boundaries."""
+    if len(text) <= max_length:
+        return text
+
+    # One pass over the candidate window records the first occurrence
+    # of each boundary, replacing four full-string find() scans.
+    head = text[:max_length + 2]
+    dot = bang = question = comma = -1
+    for i in range(len(head) - 1):
+        if head[i + 1] == ' ':
+            ch = head[i]
+            if ch == '.' and dot < 0:
+                dot = i
+            elif ch == '!' and bang < 0:
+                bang = i
+            elif ch == '?' and question < 0:
+                question = i
+            elif ch == ',' and comma < 0:
+                comma = i
+
+    # First, try to cut at first sentence (period, exclamation, question mark)
+    # but only if we get at least a few words (15 chars minimum)
+    for pos in (dot, bang, question):
+        if 15 <= pos <= max_length:
+            return text[:pos + 1]  # Include the punctuation
+
+    # Next, try to cut at comma if we get a decent amount of text
+    if 15 <= comma <= max_length:
+        return text[:comma]
+
+    # Fall back to word boundary truncation
+    truncated = text[:max_length].rsplit(' ', 1)[0]
+    return truncated + '...'
+
+
+def _link_or_copy(pair: tuple) -> None:
+    """Hardlink one image into the output dir, copying as fallback."""
+    src_path, dest_path = pair
+    try:
+        os.link(src_path, dest_path)
+    except OSError:
+        # cross-device, permissions, or no hardlink support
+        _fast_copy(src_path, dest_path)
+
+
+def _move_one(pair: tuple) -> None:
+    """Move one image into the output dir, consuming the export copy.
+
+    On the same filesystem a rename is a single directory-entry update
+    — no data moved at all. Across devices (EXDEV) it degrades to the
+    link/copy path.
+    """
+    src_path, dest_path = pair
+    try:
+        os.rename(src_path, dest_path)
+    except OSError:
+        _link_or_copy(pair)
 
 
 class SiteGenerator:
     """Generates a static website from Instagram posts."""
 
-    def __init__(self, output_dir: Path, export_dir: Path):
-        """Initialize the site generator."""
+    def __init__(self, output_dir: Path, export_dir: Path, move: bool = False):
+        """Initialize the site generator.
+
+        With move=True images are renamed out of the export instead of
+        linked/copied — an O(1) directory update per file on the same
+        filesystem, for one-shot builds that may consume the export.
+        """
         self.output_dir = Path(output_dir)
         self.export_dir = Path(export_dir)
+        self.move = move
         self.output_dir.mkdir(exist_ok=True)
 
         # Create subdirectories
@@ -21,6 +331,21 @@ class SiteGenerator:
         self.posts_dir.mkdir(exist_ok=True)
         self.images_dir.mkdir(exist_ok=True)
 
+        # filename -> "../images/{filename}", so repeat images share
+        # one string instead of re-allocating it per occurrence
+        self._rel_cache = {}
+
+        # Shared stylesheet for all generated pages
+        (self.output_dir / "styles.css").write_bytes(_CSS_BYTES)
+
+        # page key -> SHA-1 of its content, so re-runs over an
+        # unchanged archive skip rewriting identical pages
+        self._manifest_path = self.output_dir / "manifest.json"
+        try:
+            self._manifest = json.loads(self._manifest_path.read_text())
+        except (OSError, ValueError):
+            self._manifest = {}
+
     def generate_site(self, posts: List[InstagramPost], parser: InstagramParser, rss_posts: List[InstagramPost] = None, base_url: str = "http://localhost:8000"):
         """Generate the complete static site."""
         print(f"\nGenerating site in {self.output_dir}...")
@@ -30,260 +355,194 @@ class SiteGenerator:
             rss_posts = posts
 
         # Copy images and update post image paths
-        for post in posts:
-            self._copy_post_images(post, parser)
-
-        # Generate individual post pages
-        for idx, post in enumerate(posts):
-            self._generate_post_page(post, idx)
+        self._copy_images(posts, parser)
+
+        # Generate individual post pages. Rendering is pure string
+        # formatting, so large archives fan the CPU work out across a
+        # process pool; the parent just writes the results. Small
+        # archives stay serial to avoid pool spin-up overhead.
+        if len(posts) > 1000:
+            with ProcessPoolExecutor() as executor:
+                rendered = executor.map(_render_post, posts, range(len(posts)), chunksize=32)
+                for idx, html in enumerate(rendered):
+                    post_file = self.posts_dir / f"post-{idx + 1}.html"
+                    self._write_if_changed(f"post-{idx + 1}", post_file, html.encode('utf-8'))
+        else:
+            for idx, post in enumerate(posts):
+                self._generate_post_page(post, idx)
 
         # Generate index page
         self._generate_index_page(posts)
 
         # Generate RSS feed with selected posts only
-        from rss_generator import RSSGenerator
         rss_gen = RSSGenerator(base_url)
         rss_gen.generate_feed(rss_posts, self.output_dir / "feed.xml")
 
+        # Persist the content manifest for the next incremental run
+        self._manifest_path.write_text(json.dumps(self._manifest, indent=2, sort_keys=True))
+
         print(f"✓ Site generated successfully!")
         print(f"✓ {len(posts)} posts in static site")
         print(f"✓ {len(rss_posts)} posts in RSS feed")
         print(f"✓ RSS feed: {self.output_dir}/feed.xml")
 
-    def _truncate_title(self, text: str, max_length: int = 60) -> str:
-        """Truncate title smartly at sentence/phrase boundaries."""
-        if len(text) <= max_length:
-            return text
+    def _copy_images(self, posts: List[InstagramPost], parser: InstagramParser):
+        """Copy all post images to the output directory and update paths.
 
-        # First, try to cut at first sentence (period, exclamation, question mark)
-        # but only if we get at least a few words (15 chars minimum)
-        for delimiter in ['. ', '! ', '? ']:
-            pos = text.find(delimiter)
-            if 15 <= pos <= max_length:
-                return text[:pos + 1]  # Include the punctuation
+        Builds one deduplicated copy plan across every post, dispatches
+        it to a thread pool (the GIL is released during file I/O, so
+        many links/copies stay in flight at once), then rewrites each
+        post's image paths in a second pass.
+        """
+        # Phase 1: resolve each unique filename once. Repeat occurrences
+        # (carousel reshares across posts) are answered by the dict
+        # without building a path or touching the filesystem again.
+        available = {}
+        pending = []
 
-        # Next, try to cut at comma if we get a decent amount of text
-        comma_pos = text.find(', ')
-        if 15 <= comma_pos <= max_length:
-            return text[:comma_pos]
+        # One scandir of the output dir replaces a stat() per image when
+        # deciding what still needs copying.
+        existing = {entry.name for entry in os.scandir(self.images_dir)}
 
-        # Fall back to word boundary truncation
-        if len(text) > max_length:
-            truncated = text[:max_length].rsplit(' ', 1)[0]
-            return truncated + '...'
-
-        return text
-
-    def _copy_post_images(self, post: InstagramPost, parser: InstagramParser):
-        """Copy post images to output directory and update paths."""
-        new_image_paths = []
-
-        for img_path in post.images:
-            src_path = parser.get_full_image_path(img_path)
-
-            if not src_path.exists():
-                continue
-
-            # Create a unique filename
-            dest_filename = src_path.name
-            dest_path = self.images_dir / dest_filename
-
-            # Copy if doesn't exist
-            if not dest_path.exists():
-                shutil.copy2(src_path, dest_path)
-
-            # Store relative path for HTML
-            new_image_paths.append(f"../images/{dest_filename}")
-
-        # Update post with new paths
-        post.images = new_image_paths
+        for post in posts:
+            for img_path in post.images:
+                dest_filename = img_path.rsplit('/', 1)[-1]
+                if dest_filename in available:
+                    continue
+                src_path = parser.get_full_image_path(img_path)
+                if not src_path.exists():
+                    available[dest_filename] = False
+                    continue
+                available[dest_filename] = True
+                if dest_filename not in existing:
+                    pending.append((src_path, self.images_dir / dest_filename))
+                    existing.add(dest_filename)
+
+        # Phase 2: link/copy in parallel. The images are read-only
+        # artifacts of the export, so a hardlink — one directory entry,
+        # zero data moved — is safe and beats any copy.
+        if pending:
+            transfer = _move_one if self.move else _link_or_copy
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(transfer, pending))
+
+        # Phase 3: rewrite posts to site-relative paths
+        rel_cache = self._rel_cache
+        for post in posts:
+            new_paths = []
+            for img_path in post.images:
+                name = img_path.rsplit('/', 1)[-1]
+                if not available[name]:
+                    continue
+                rel = rel_cache.get(name)
+                if rel is None:
+                    rel = f"../images/{name}"
+                    rel_cache[name] = rel
+                new_paths.append(rel)
+            post.images = new_paths
 
     def _generate_post_page(self, post: InstagramPost, idx: int):
         """Generate an individual post page."""
-        post_id = f"post-{idx + 1}"
-        post_file = self.posts_dir / f"{post_id}.html"
-
-        # Parse date
-        date_str = post.date or "Unknown date"
-
-        # Truncate title if too long, but keep full text for body
-        full_text = post.title or 'Instagram Post'
-        title = self._truncate_title(full_text, max_length=60)
-
-        # Generate images HTML
-        images_html = ""
-        for img_path in post.images:
-            images_html += f'        <img src="{img_path}" alt="Instagram post image" style="max-width: 100%; margin: 30px 0; display: block;">\n'
-
-        # Generate hashtags HTML
-        hashtags_html = ""
-        if post.hashtags:
-            tags = ' '.join([f'<span style="display: inline-block; background: #e1f5fe; color: #01579b; padding: 4px 8px; margin: 2px; border-radius: 4px; font-size: 14px;">#{tag}</span>' for tag in post.hashtags])
-            hashtags_html = f"""
-        <div style="margin: 20px 0;">
-            {tags}
-        </div>
-"""
-
-        # Generate location HTML
-        location_html = ""
-        if post.latitude and post.longitude:
-            location_html = f"""
-        <p style="color: #666; font-size: 14px;">
-            📍 Location: {post.latitude}, {post.longitude}
-        </p>
-"""
-
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{post.title or 'Instagram Post'}</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            line-height: 1.6;
-        }}
-        h1 {{
-            margin-bottom: 10px;
-        }}
-        .meta {{
-            color: #666;
-            margin-bottom: 30px;
-        }}
-        img {{
-            display: block;
-            margin: 20px auto;
-        }}
-        a {{
-            color: #0066cc;
-            text-decoration: none;
-        }}
-        a:hover {{
-            text-decoration: underline;
-        }}
-    </style>
-</head>
-<body>
-    <a href="../index.html">← Back to all posts</a>
-
-    <article>
-        <h1>{title}</h1>
-        <div class="meta">
-            <time>{date_str}</time>
-        </div>
-
-        <p style="font-style: italic; color: #666; font-size: 14px; margin-bottom: 10px;">
-            Imported from Instagram.
-        </p>
-
-        <p style="font-size: 16px; line-height: 1.6; margin-bottom: 30px;">
-            {full_text}
-        </p>
-
-{hashtags_html}
-{images_html}
-{location_html}
-    </article>
-</body>
-</html>
-"""
-
-        post_file.write_text(html, encoding='utf-8')
+        post_file = self.posts_dir / f"post-{idx + 1}.html"
+        # Encode once and publish atomically; write_text would wrap the
+        # file in a TextIOWrapper and re-encode through its buffer.
+        self._write_if_changed(f"post-{idx + 1}", post_file, _render_post(post, idx).encode('utf-8'))
+
+    def _write_if_changed(self, key: str, path: Path, data: bytes) -> None:
+        """Write a page unless its content hash matches the manifest.
+
+        On a daily-regenerated archive where only the newest post
+        changed, this collapses N page writes to a handful.
+        """
+        digest = hashlib.sha1(data).hexdigest()
+        if self._manifest.get(key) == digest and path.exists():
+            return
+        _write_page(path, data)
+        self._manifest[key] = digest
 
     def _generate_index_page(self, posts: List[InstagramPost]):
         """Generate the index page with all posts."""
-        posts_html = ""
+        # Stream article fragments into one bytes buffer: no giant
+        # posts_html intermediate, no second whole-page string, and no
+        # final encode-the-world step. bytearray append is amortized
+        # O(1), so peak memory stays ~1x the final page size.
+        buf = bytearray()
+        buf += _INDEX_HEADER_TMPL.substitute(post_count=len(posts)).encode('utf-8')
 
         for idx, post in enumerate(posts):
             post_id = f"post-{idx + 1}"
 
-            # Truncate title for index page
-            title = self._truncate_title(post.title or 'Instagram Post', max_length=60)
+            # Bind fields once and escape once; titles can contain
+            # markup-significant characters.
+            images = post.images
+            # Inline length check: most captions are short, so skip the
+            # truncation call entirely for them
+            title_raw = post.title or 'Instagram Post'
+            title = escape(title_raw if len(title_raw) <= 60 else _truncate_title(title_raw, max_length=60))
 
             # Get first image for thumbnail
-            thumb = post.images[0] if post.images else ""
+            thumb = images[0] if images else ""
             thumb_html = f'<img src="{thumb.replace("../", "")}" style="max-width: 200px; margin-right: 20px;">' if thumb else ""
 
             # Generate hashtags for index
-            hashtags_index_html = ""
-            if post.hashtags:
-                tags = ' '.join([f'<span style="display: inline-block; background: #e1f5fe; color: #01579b; padding: 3px 6px; margin: 2px; border-radius: 3px; font-size: 12px;">#{tag}</span>' for tag in post.hashtags])
-                hashtags_index_html = f'<div style="margin-top: 8px;">{tags}</div>'
-
-            posts_html += f"""
-        <article style="border-bottom: 1px solid #eee; padding: 20px 0; display: flex; gap: 20px;">
-            {thumb_html}
-            <div>
-                <h2 style="margin-top: 0;">
-                    <a href="posts/{post_id}.html">{title}</a>
-                </h2>
-                <p style="color: #666;">{post.date}</p>
-                <p>{len(post.images)} image(s)</p>
-                {hashtags_index_html}
-            </div>
-        </article>
-"""
-
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Instagram Archive</title>
-    <link rel="alternate" type="application/rss+xml" title="RSS Feed" href="feed.xml">
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
-            max-width: 900px;
-            margin: 0 auto;
-            padding: 20px;
-            line-height: 1.6;
-        }}
-        h1 {{
-            border-bottom: 3px solid #333;
-            padding-bottom: 10px;
-        }}
-        a {{
-            color: #0066cc;
-            text-decoration: none;
-        }}
-        a:hover {{
-            text-decoration: underline;
-        }}
-        .rss-link {{
-            background: #ff6600;
-            color: white;
-            padding: 10px 20px;
-            border-radius: 5px;
-            display: inline-block;
-            margin: 20px 0;
-        }}
-        .rss-link:hover {{
-            background: #cc5200;
-            text-decoration: none;
-        }}
-    </style>
-</head>
-<body>
-    <h1>Instagram Archive</h1>
+            hashtags_index_html = _render_hashtags_index(tuple(post.hashtags)) if post.hashtags else ""
 
-    <a href="feed.xml" class="rss-link">📡 RSS Feed</a>
-
-    <p style="color: #666;">
-        {len(posts)} posts from Instagram export
-    </p>
+            buf += _INDEX_ARTICLE_TMPL.substitute(
+                thumb_html=thumb_html,
+                post_id=post_id,
+                title=title,
+                date=escape(post.date),
+                image_count=len(images),
+                hashtags_index_html=hashtags_index_html,
+            ).encode('utf-8')
 
-    <div>
-{posts_html}
-    </div>
-</body>
-</html>
-"""
+        buf += _INDEX_FOOTER.encode('utf-8')
 
         index_file = self.output_dir / "index.html"
-        index_file.write_text(html, encoding='utf-8')
+        self._write_if_changed("index", index_file, bytes(buf))
+
+
+def _render_post(post: InstagramPost, idx: int) -> str:
+    """Render an individual post page to HTML.
+
+    Module-level so a process pool can map it over posts without
+    dragging the SiteGenerator instance along.
+    """
+    # Bind fields once and escape once; titles can contain
+    # markup-significant characters.
+    date_str = escape(post.date or "Unknown date")
+
+    # Truncate title if too long, but keep full text for body
+    title_raw = post.title or 'Instagram Post'
+    full_text = escape(title_raw)
+    # Inline length check: skip the truncation call for short captions
+    title = full_text if len(title_raw) <= 60 else escape(_truncate_title(title_raw, max_length=60))
+
+    # Emit the optional sections straight into one fragment list — no
+    # hashtags_html/images_html/location_html intermediates, and a
+    # single join builds the page.
+    out = [_POST_HEADER_TMPL.substitute(
+        page_title=full_text,
+        title=title,
+        date_str=date_str,
+        full_text=full_text,
+    )]
+
+    if post.hashtags:
+        out.append(_render_hashtags_post(tuple(post.hashtags)))
+    out.append('\n')
+
+    for img_path in post.images:
+        out.append(f'        <img src="{img_path}" alt="Instagram post image" style="max-width: 100%; margin: 30px 0; display: block;">\n')
+    out.append('\n')
+
+    if post.latitude and post.longitude:
+        out.append(f"""
+        <p style="color: #666; font-size: 14px;">
+            📍 Location: {post.latitude}, {post.longitude}
+        </p>
+""")
+
+    out.append(_POST_FOOTER)
+    return "".join(out)